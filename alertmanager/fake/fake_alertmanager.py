@@ -1,20 +1,70 @@
 #!/usr/bin/env python3
 
-import json
+import functools
+import gzip
+import os
 import random
 import time
 import re
+import sched
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta, UTC
-from flask import Flask, jsonify, request
-from threading import Thread
+from itertools import accumulate
+from urllib.parse import parse_qsl
+import orjson
+from flask import Flask, Response, request
+from flask.json.provider import JSONProvider
+from werkzeug.datastructures import MultiDict
+from threading import RLock, Thread
 import uuid
 
+# Alert timestamps are kept as aware datetimes and rendered as RFC3339 with a trailing Z
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return Response(orjson.dumps(obj, option=ORJSON_OPTIONS), mimetype='application/json')
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Global storage for alerts and silences (alerts are keyed by fingerprint, oldest first)
+alerts = OrderedDict()
+# Alert groups keyed by "<receiver>_<alertname>", maintained as alerts come and go
+alert_groups = {}
+# Alert fingerprints keyed by status state, kept in step by store_alert, discard_alert and set_alert_state
+alerts_by_state = defaultdict(set)
+# Silences keyed by id, in creation order
+silences = {}
+# Silence ids keyed by matcher (name, value); each bucket is a dict used as an ordered set
+silence_matcher_index = defaultdict(dict)
+# Silences without a plain equality matcher on a non-empty value cannot be found through
+# silence_matcher_index. Those with a group-free regex matcher are gated by it instead:
+# label name -> {silence id: regex}; the rest are checked against every alert
+silence_regex_gates = defaultdict(dict)
+unindexed_silence_ids = {}
+# Alternation of the gating regexes per label name, dropped whenever that label's gates change
+combined_regexes = {}
+# (startsAt, endsAt) per silence as epoch seconds, parsed once when the silence is stored
+silence_windows = {}
+# (name, compiled regex or None, value, isEqual) per matcher of each silence, keyed by silence id
+silence_matchers = {}
 
-# Global storage for alerts and silences
-alerts = []
-alert_groups = []
-silences = []
+# Guards alerts, silences and their indexes; the generator thread and request handlers
+# hold it while reading or mutating them
+state_lock = RLock()
+
+# Bumped on every alert mutation; keys the cached alert and alert group responses
+alerts_version = 0
 
 # Sample alert templates with various severity levels
 ALERT_TEMPLATES = [
@@ -158,6 +208,29 @@ ALERT_TEMPLATES = [
     }
 ]
 
+# Precompute the per-template invariants used by generate_random_alert
+for template in ALERT_TEMPLATES:
+    # Base labels; instance (and possibly severity) are filled in per alert
+    template["_labels"] = {
+        "alertname": template["alertname"],
+        "severity": template["severity"],
+        "instance": "",
+        "job": template["job"],
+        "team": template["team"]
+    }
+    
+    # Add additional labels if present in template
+    for key in ["service", "environment", "sentry"]:
+        if key in template:
+            template["_labels"][key] = template[key]
+    
+    # Text around each {instance} placeholder, rejoined with the instance per alert
+    for key in ["instance", "description", "summary"]:
+        template[f"_{key}_parts"] = template[key].split("{instance}")
+    
+    template["_runbook_url"] = f"https://runbooks.example.com/{template['alertname'].lower()}"
+    template["_generator_url"] = f"http://prometheus:9090/graph?g0.expr=up{{job=\"{template['job']}\"}}&g0.tab=1"
+
 # Severity levels with weights for random selection (higher weight = more frequent)
 SEVERITY_WEIGHTS = {
     "critical": 20,
@@ -165,30 +238,112 @@ SEVERITY_WEIGHTS = {
     "info": 20
 }
 
+# Cadences of the background alert generator tasks, in seconds
+GENERATE_INTERVAL = 15
+SILENCE_CHECK_INTERVAL = 5
+RESOLUTION_INTERVAL = 30
+CLEANUP_INTERVAL = 60
+
+# Most alerts kept at once; the oldest are evicted first
+MAX_ALERTS = 150
+
 RECEIVER_NAMES = ["web.hook", "email-team", "slack-critical", "pagerduty", "discord-alerts"]
 
+def batched_draws(population, cum_weights=None, batch=1024):
+    """Return a function drawing random picks from population, generated in batches"""
+    pool = iter(())
+    
+    def draw():
+        nonlocal pool
+        # next() on a list iterator is atomic, so concurrent callers at worst both refill
+        try:
+            return next(pool)
+        except StopIteration:
+            pool = iter(random.choices(population, cum_weights=cum_weights, k=batch))
+            return next(pool)
+    
+    return draw
+
+draw_template = batched_draws(ALERT_TEMPLATES)
+draw_instance_id = batched_draws(range(1, 21))
+draw_receiver = batched_draws(RECEIVER_NAMES)
+draw_severity = batched_draws(tuple(SEVERITY_WEIGHTS), cum_weights=list(accumulate(SEVERITY_WEIGHTS.values())))
+# 80% active, 20% unprocessed
+draw_initial_state = batched_draws(["active", "unprocessed"], cum_weights=[4, 5])
+
+# JSON bodies at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_SIZE = 1024
+
+@functools.lru_cache(maxsize=32)
+def gzip_body(body):
+    """Compress a response body; cached response bodies are compressed only once"""
+    return gzip.compress(body, compresslevel=1, mtime=0)
+
+def json_response(body, status=200):
+    """Wrap serialized JSON in a response, compressing large bodies when the client accepts gzip"""
+    response = Response(body, status=status, mimetype='application/json')
+    
+    if len(body) >= GZIP_MIN_SIZE:
+        response.vary.add('Accept-Encoding')
+        if request.accept_encodings['gzip']:
+            response.set_data(gzip_body(body))
+            response.headers['Content-Encoding'] = 'gzip'
+    
+    return response
+
+def j(data, status=200):
+    """Serialize data with orjson and wrap it in a JSON response"""
+    return json_response(orjson.dumps(data, option=ORJSON_OPTIONS), status)
+
+def mark_alerts_changed():
+    """Invalidate cached alert responses after alerts were added, removed or updated"""
+    global alerts_version
+    alerts_version += 1
+
+def set_alert_state(alert, state):
+    """Change an alert's status state, keeping alerts_by_state in step"""
+    status = alert['status']
+    if status['state'] != state:
+        alerts_by_state[status['state']].discard(alert['fingerprint'])
+        alerts_by_state[state].add(alert['fingerprint'])
+        status['state'] = state
+
 def generate_fingerprint():
     """Generate a unique fingerprint for an alert"""
-    return ''.join(random.choices('0123456789abcdef', k=16))
+    return os.urandom(8).hex()
 
-def matches_label(matcher, label_value):
-    """Check if a matcher matches a label value"""
+@functools.lru_cache(maxsize=2048)
+def compiled_regex(pattern):
+    """Compile a matcher regex once and reuse it across silence checks"""
+    return re.compile(pattern)
+
+def matches_label(matcher_value, is_regex, is_equal, label_value, pattern=None, match_cache=None):
+    """Check if a matcher, given by its value and flags, matches a label value
+
+    pattern is the matcher's compiled regex for regex matchers. Like Alertmanager,
+    regexes must match the whole label value. match_cache, when given, memoizes
+    regex results by (pattern, label value) for the duration of a silence sweep.
+    """
     if label_value is None:
         label_value = ""
     
-    matcher_value = matcher.get('value', '')
-    is_regex = matcher.get('isRegex', False)
-    is_equal = matcher.get('isEqual', True)
+    # Plain equality is the common case and needs none of the bookkeeping below
+    if not is_regex and is_equal:
+        return label_value == matcher_value
     
     if is_regex:
-        try:
-            pattern = re.compile(matcher_value)
-            matches = bool(pattern.search(str(label_value)))
-        except re.error:
-            # Invalid regex pattern
-            matches = False
+        cache_key = (matcher_value, label_value)
+        matches = match_cache.get(cache_key) if match_cache is not None else None
+        
+        if matches is None:
+            if pattern is None:
+                pattern = compiled_regex(matcher_value)
+            matches = pattern.fullmatch(label_value) is not None
+            
+            if match_cache is not None:
+                match_cache[cache_key] = matches
     else:
-        matches = str(label_value) == matcher_value
+        matches = label_value == matcher_value
     
     # Handle isEqual flag (negation)
     if is_equal:
@@ -196,67 +351,182 @@ def matches_label(matcher, label_value):
     else:
         return not matches
 
-def match_silence_to_alert(silence, alert):
+def parse_timestamp(value):
+    """Parse an RFC 3339 timestamp into epoch seconds, treating naive values as UTC"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+def match_silence_to_alert(silence, alert, match_cache=None, now=None):
     """Check if a silence applies to an alert based on matchers"""
-    # Check if silence is active
-    now = datetime.now(UTC)
-    starts_at = datetime.fromisoformat(silence['startsAt'].replace('Z', '+00:00'))
-    ends_at = datetime.fromisoformat(silence['endsAt'].replace('Z', '+00:00'))
+    if now is None:
+        now = time.time()
+    starts_at, ends_at = silence_windows[silence['id']]
     
     # Check if silence is within active time range
     if now < starts_at or now > ends_at:
         return False
     
     # All matchers must match for the silence to apply
-    for matcher in silence.get('matchers', []):
-        label_name = matcher.get('name', '')
-        label_value = alert['labels'].get(label_name)
-        
-        if not matches_label(matcher, label_value):
+    labels = alert['labels']
+    for name, pattern, value, is_equal in silence_matchers[silence['id']]:
+        if not matches_label(value, pattern is not None, is_equal, labels.get(name), pattern, match_cache):
             return False
     
     return True
 
+def combined_regex(label_name):
+    """Regex matching any value that one of the label's gating regexes fully matches"""
+    combined = combined_regexes.get(label_name)
+    if combined is None:
+        patterns = silence_regex_gates[label_name].values()
+        try:
+            combined = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+        except re.error:
+            # e.g. inline global flags, which are only valid at the start of a pattern;
+            # let every value through to the per-silence checks
+            combined = re.compile("(?s:.*)")
+        combined_regexes[label_name] = combined
+    
+    return combined
+
 def apply_silences_to_alerts():
     """Apply all active silences to all alerts"""
-    now = datetime.now(UTC)
+    changed = False
+    # Alerts share many label values, so regex results are reused within this sweep
+    match_cache = {}
+    now = time.time()
     
-    for alert in alerts:
-        # Reset silence state
-        silenced_by = []
+    for alert in alerts.values():
+        # A silence can only match if one of its matchers names one of the alert's exact
+        # label pairs, unless it has no plain equality matcher at all
+        candidate_ids = dict.fromkeys(unindexed_silence_ids)
+        for label in alert['labels'].items():
+            bucket = silence_matcher_index.get(label)
+            if bucket:
+                candidate_ids.update(bucket)
         
-        # Check each silence against this alert
-        for silence in silences:
-            if match_silence_to_alert(silence, alert):
-                silenced_by.append(silence['id'])
+        # One combined regex per label rules out all silences gated on it at once
+        for label_name, gated in silence_regex_gates.items():
+            if combined_regex(label_name).fullmatch(alert['labels'].get(label_name, "")):
+                candidate_ids.update(gated)
+        
+        # Check each candidate silence against this alert
+        silenced_by = [
+            silence_id for silence_id in candidate_ids
+            if match_silence_to_alert(silences[silence_id], alert, match_cache, now)
+        ]
         
         # Update alert status based on silences
+        status = alert['status']
         if silenced_by:
-            alert['status']['state'] = 'suppressed'
-            alert['status']['silencedBy'] = silenced_by
+            state = 'suppressed'
         else:
             # Only change back to active if it was suppressed
-            if alert['status']['state'] == 'suppressed':
-                alert['status']['state'] = 'active'
-            alert['status']['silencedBy'] = []
+            state = 'active' if status['state'] == 'suppressed' else status['state']
+        
+        if state != status['state'] or silenced_by != status['silencedBy']:
+            set_alert_state(alert, state)
+            status['silencedBy'] = silenced_by
+            changed = True
+    
+    if changed:
+        mark_alerts_changed()
 
 def remove_silence_from_alerts(silence_id):
     """Remove a specific silence from all alerts"""
-    for alert in alerts:
+    changed = False
+    
+    for alert in alerts.values():
         if silence_id in alert['status'].get('silencedBy', []):
             alert['status']['silencedBy'].remove(silence_id)
+            changed = True
             
             # If no more silences, change state back to active
             if not alert['status']['silencedBy']:
                 if alert['status']['state'] == 'suppressed':
-                    alert['status']['state'] = 'active'
+                    set_alert_state(alert, 'active')
+    
+    if changed:
+        mark_alerts_changed()
+
+def add_silence(silence):
+    """Store a silence and index its matchers, replacing any silence with the same id
+
+    Regex matchers, the time window and the index keys are built here, so an
+    invalid pattern, timestamp or unhashable matcher raises before anything is stored.
+    """
+    matchers = [
+        (
+            matcher['name'],
+            compiled_regex(matcher['value']) if matcher.get('isRegex') else None,
+            matcher['value'],
+            matcher.get('isEqual', True)
+        )
+        for matcher in silence['matchers']
+    ]
+    window = (parse_timestamp(silence['startsAt']), parse_timestamp(silence['endsAt']))
+    index_keys = dict.fromkeys((matcher['name'], matcher['value']) for matcher in silence['matchers'])
+    
+    remove_silence(silence['id'])
+    silences[silence['id']] = silence
+    silence_matchers[silence['id']] = matchers
+    silence_windows[silence['id']] = window
+    
+    if not any(pattern is None and is_equal and value != '' for _, pattern, value, is_equal in matchers):
+        # Regexes with groups are left out, as combining them would renumber their backreferences
+        gate = next(
+            (
+                (name, pattern) for name, pattern, _, is_equal in matchers
+                if pattern is not None and is_equal and not pattern.groups
+            ),
+            None
+        )
+        if gate is None:
+            unindexed_silence_ids[silence['id']] = None
+        else:
+            name, pattern = gate
+            silence_regex_gates[name][silence['id']] = pattern.pattern
+            combined_regexes.pop(name, None)
+    
+    for key in index_keys:
+        silence_matcher_index[key][silence['id']] = None
+
+def remove_silence(silence_id):
+    """Remove a silence and its matcher index entries, returning it if it existed"""
+    silence = silences.pop(silence_id, None)
+    if silence is None:
+        return None
+    
+    matchers = silence_matchers.pop(silence_id)
+    del silence_windows[silence_id]
+    unindexed_silence_ids.pop(silence_id, None)
+    
+    for name, _, _, _ in matchers:
+        gated = silence_regex_gates.get(name)
+        if gated and silence_id in gated:
+            del gated[silence_id]
+            combined_regexes.pop(name, None)
+            if not gated:
+                del silence_regex_gates[name]
+    
+    for matcher in silence['matchers']:
+        key = (matcher['name'], matcher['value'])
+        bucket = silence_matcher_index.get(key)
+        if bucket is not None:
+            bucket.pop(silence_id, None)
+            if not bucket:
+                del silence_matcher_index[key]
+    
+    return silence
 
 def check_silence_expiration():
     """Check for expired silences and update their status"""
-    now = datetime.now(UTC)
+    now = time.time()
     
-    for silence in silences:
-        ends_at = datetime.fromisoformat(silence['endsAt'].replace('Z', '+00:00'))
+    for silence in silences.values():
+        ends_at = silence_windows[silence['id']][1]
         
         if now > ends_at and silence['status']['state'] == 'active':
             silence['status']['state'] = 'expired'
@@ -265,52 +535,40 @@ def check_silence_expiration():
 
 def get_weighted_severity():
     """Get a random severity based on weights"""
-    severities = list(SEVERITY_WEIGHTS.keys())
-    weights = list(SEVERITY_WEIGHTS.values())
-    return random.choices(severities, weights=weights)[0]
+    return draw_severity()
 
 def generate_random_alert():
     """Generate a random alert based on templates"""
-    template = random.choice(ALERT_TEMPLATES)
-    instance_id = random.randint(1, 20)
-    instance_name = template["instance"].format(instance=instance_id)
+    template = draw_template()
+    instance_id = draw_instance_id()
+    instance_name = str(instance_id).join(template["_instance_parts"])
 
     # 20% chance to override template severity with weighted random severity
     severity = get_weighted_severity() if random.random() < 0.2 else template["severity"]
 
     # New alerts start at current time (0s duration)
-    starts_at = datetime.now(UTC)
-    ends_at = starts_at + timedelta(hours=random.randint(1, 6))
-    
-    # Build base labels
-    labels = {
-        "alertname": template["alertname"],
-        "severity": severity,
-        "instance": instance_name,
-        "job": template["job"],
-        "team": template["team"]
-    }
+    now = datetime.now(UTC)
+    ends_at = now + timedelta(hours=random.randint(1, 6))
     
-    # Add additional labels if present in template
-    for key in ["service", "environment", "sentry"]:
-        if key in template:
-            labels[key] = template[key]
+    labels = template["_labels"].copy()
+    labels["severity"] = severity
+    labels["instance"] = instance_name
     
     alert = {
         "labels": labels,
         "annotations": {
-            "description": template["description"].format(instance=instance_name),
-            "summary": template["summary"].format(instance=instance_name),
-            "runbook_url": f"https://runbooks.example.com/{template['alertname'].lower()}"
+            "description": instance_name.join(template["_description_parts"]),
+            "summary": instance_name.join(template["_summary_parts"]),
+            "runbook_url": template["_runbook_url"]
         },
-        "startsAt": starts_at.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-        "endsAt": ends_at.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-        "updatedAt": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-        "generatorURL": f"http://prometheus:9090/graph?g0.expr=up{{job=\"{template['job']}\"}}&g0.tab=1",
+        "startsAt": now,
+        "endsAt": ends_at,
+        "updatedAt": now,
+        "generatorURL": template["_generator_url"],
         "fingerprint": generate_fingerprint(),
-        "receivers": [{"name": random.choice(RECEIVER_NAMES)}],
+        "receivers": [{"name": draw_receiver()}],
         "status": {
-            "state": random.choice(["active", "active", "active", "active", "unprocessed"]),  # 80% active, 20% unprocessed
+            "state": draw_initial_state(),
             "silencedBy": [],
             "inhibitedBy": [],
             "mutedBy": []
@@ -321,229 +579,279 @@ def generate_random_alert():
     
     return alert
 
-def create_alert_groups():
-    """Create alert groups from individual alerts according to OpenAPI spec"""
-    global alert_groups
-    groups = {}
-    
-    for alert in alerts:
-        # Group by receiver and alertname
-        receiver_name = alert["receivers"][0]["name"]
-        alertname = alert["labels"]["alertname"]
-        group_key = f"{receiver_name}_{alertname}"
-        
-        if group_key not in groups:
-            # Create group labels (common labels across all alerts in the group)
-            group_labels = {
-                "alertname": alertname,
-                "job": alert["labels"]["job"]
-            }
-            
-            groups[group_key] = {
-                "labels": group_labels,
-                "receiver": alert["receivers"][0],
-                "alerts": []
-            }
+def alert_group_key(alert):
+    """Group by receiver and alertname"""
+    return f"{alert['receivers'][0]['name']}_{alert['labels'].get('alertname', '')}"
+
+def add_alert_to_group(alert):
+    """Add an alert to its group according to OpenAPI spec, creating the group if needed"""
+    group_key = alert_group_key(alert)
+    group = alert_groups.get(group_key)
+    
+    if group is None:
+        # Create group labels (common labels across all alerts in the group)
+        group_labels = {
+            "alertname": alert["labels"].get("alertname", ""),
+            "job": alert["labels"].get("job", "")
+        }
         
-        groups[group_key]["alerts"].append(alert)
+        group = alert_groups[group_key] = {
+            "labels": group_labels,
+            "receiver": alert["receivers"][0],
+            "alerts": []
+        }
     
-    alert_groups = list(groups.values())
+    group["alerts"].append(alert)
 
-def alert_generator():
-    """Background thread to generate random alerts and resolve them periodically"""
-    last_resolution_time = datetime.now(UTC)
-    last_silence_check = datetime.now(UTC)
+def remove_alert_from_group(alert):
+    """Remove an alert from its group, dropping the group once it is empty"""
+    group_key = alert_group_key(alert)
+    group = alert_groups[group_key]
+    group["alerts"].remove(alert)
     
-    while True:
-        current_time = datetime.now(UTC)
-        
-        # Generate new alerts randomly (increased frequency for more alerts)
-        if random.random() < 0.6:  # 60% chance every 15 seconds
-            new_alert = generate_random_alert()
-            alerts.append(new_alert)
-            
-            # Keep only last 150 alerts (increased for more active alerts)
-            if len(alerts) > 150:
-                alerts.pop(0)
-            
-            create_alert_groups()
-        
-        # Update existing alerts randomly
-        for alert in alerts:
-            if random.random() < 0.1:  # 10% chance to update
-                alert["updatedAt"] = datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-                if alert["status"]["state"] == "unprocessed":
-                    alert["status"]["state"] = "active"
-        
-        # Check and apply silences every 5 seconds
-        if (current_time - last_silence_check).total_seconds() >= 5:
-            # Check for expired silences
-            check_silence_expiration()
-            # Apply all active silences to alerts
-            apply_silences_to_alerts()
-            last_silence_check = current_time
+    if not group["alerts"]:
+        del alert_groups[group_key]
+
+def store_alert(alert):
+    """Store a new alert and add it to its group and the state index"""
+    # Group first: if it fails, the alert is not left stored outside any group
+    add_alert_to_group(alert)
+    alerts[alert["fingerprint"]] = alert
+    alerts_by_state[alert["status"]["state"]].add(alert["fingerprint"])
+
+def discard_alert(alert):
+    """Remove a stored alert from the store, its group and the state index"""
+    del alerts[alert["fingerprint"]]
+    remove_alert_from_group(alert)
+    alerts_by_state[alert["status"]["state"]].discard(alert["fingerprint"])
+
+def trim_alerts():
+    """Evict the oldest alerts beyond MAX_ALERTS"""
+    while len(alerts) > MAX_ALERTS:
+        discard_alert(next(iter(alerts.values())))
+
+def generate_tick():
+    """Generate a new alert and randomly update or remove existing ones"""
+    current_time = datetime.now(UTC)
+    
+    # Generate new alerts randomly (increased frequency for more alerts)
+    if random.random() < 0.6:  # 60% chance every GENERATE_INTERVAL
+        new_alert = generate_random_alert()
+        store_alert(new_alert)
         
-        # Resolve alerts every 30 seconds (for testing resolved alerts feature)
-        if (current_time - last_resolution_time).total_seconds() >= 30:
-            print(f"[{current_time.strftime('%H:%M:%S')}] Resolving alerts for testing...", flush=True)
-            
-            # Resolve 15-25% of active alerts (reduced to keep more active alerts)
-            active_alerts = [alert for alert in alerts if alert["status"]["state"] == "active"]
-            if active_alerts:
-                resolve_count = max(1, int(len(active_alerts) * random.uniform(0.15, 0.25)))
-                alerts_to_resolve = random.sample(active_alerts, min(resolve_count, len(active_alerts)))
-                
-                for alert in alerts_to_resolve:
-                    # Mark as resolved instead of removing completely
-                    alert["status"]["state"] = "resolved"
-                    alert["endsAt"] = datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-                    alert["updatedAt"] = datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-                    print(f"  Resolved: {alert['labels']['alertname']} on {alert['labels']['instance']}", flush=True)
-                
-                create_alert_groups()
-                print(f"  Total resolved: {len(alerts_to_resolve)} alerts", flush=True)
-            else:
-                print("  No active alerts to resolve", flush=True)
-            
-            last_resolution_time = current_time
+        trim_alerts()
+        mark_alerts_changed()
+    
+    # Update existing alerts randomly
+    updated = False
+    for alert in alerts.values():
+        if random.random() < 0.1:  # 10% chance to update
+            alert["updatedAt"] = current_time
+            if alert["status"]["state"] == "unprocessed":
+                set_alert_state(alert, "active")
+            updated = True
+    
+    if updated:
+        mark_alerts_changed()
+    
+    # Remove some old alerts randomly (less frequently now)
+    if alerts and random.random() < 0.02:  # 2% chance to remove (reduced from 5%)
+        discard_alert(next(iter(alerts.values())))
+        mark_alerts_changed()
+
+def cleanup_tick():
+    """Remove resolved alerts once they have been resolved for an hour"""
+    one_hour_ago = datetime.now(UTC) - timedelta(hours=1)
+    
+    # Resolution stamps endsAt with a datetime, so it compares directly
+    alerts_to_remove = [
+        alerts[fingerprint] for fingerprint in list(alerts_by_state["resolved"])
+        if alerts[fingerprint]["endsAt"] < one_hour_ago
+    ]
+    
+    if alerts_to_remove:
+        for alert in alerts_to_remove:
+            discard_alert(alert)
         
-        # Clean up old resolved alerts (keep resolved alerts for 1 hour, then remove)
-        if alerts and random.random() < 0.1:  # 10% chance to check for cleanup
-            cleanup_count = 0
-            one_hour_ago = current_time - timedelta(hours=1)
-            
-            alerts_to_remove = []
-            for alert in alerts:
-                if alert["status"]["state"] == "resolved":
-                    ends_at = datetime.fromisoformat(alert["endsAt"].replace('Z', '+00:00'))
-                    if ends_at < one_hour_ago:
-                        alerts_to_remove.append(alert)
-            
-            for alert in alerts_to_remove:
-                alerts.remove(alert)
-                cleanup_count += 1
-            
-            if cleanup_count > 0:
-                print(f"  Cleaned up {cleanup_count} old resolved alerts", flush=True)
-                create_alert_groups()
+        print(f"  Cleaned up {len(alerts_to_remove)} old resolved alerts", flush=True)
+        mark_alerts_changed()
+
+def silence_tick():
+    """Expire silences and apply the active ones to alerts"""
+    check_silence_expiration()
+    apply_silences_to_alerts()
+
+def resolve_tick():
+    """Resolve a random share of active alerts (for testing the resolved alerts feature)"""
+    current_time = datetime.now(UTC)
+    print(f"[{current_time.strftime('%H:%M:%S')}] Resolving alerts for testing...", flush=True)
+    
+    # Resolve 15-25% of active alerts (reduced to keep more active alerts)
+    active_alerts = [alerts[fingerprint] for fingerprint in list(alerts_by_state["active"])]
+    if active_alerts:
+        resolve_count = max(1, int(len(active_alerts) * random.uniform(0.15, 0.25)))
+        alerts_to_resolve = random.sample(active_alerts, min(resolve_count, len(active_alerts)))
         
-        # Remove some old alerts randomly (less frequently now)
-        if alerts and random.random() < 0.02:  # 2% chance to remove (reduced from 5%)
-            alerts.pop(0)
-            create_alert_groups()
+        for alert in alerts_to_resolve:
+            # Mark as resolved instead of removing completely
+            set_alert_state(alert, "resolved")
+            alert["endsAt"] = current_time
+            alert["updatedAt"] = current_time
+            print(f"  Resolved: {alert['labels'].get('alertname', '')} on {alert['labels'].get('instance', '')}", flush=True)
         
-        time.sleep(15)
+        mark_alerts_changed()
+        print(f"  Total resolved: {len(alerts_to_resolve)} alerts", flush=True)
+    else:
+        print("  No active alerts to resolve", flush=True)
 
-def filter_alerts_by_params(alert_list, args):
-    """Filter alerts based on query parameters"""
-    filtered = []
+def alert_generator():
+    """Background thread running the generator ticks, each at its own cadence"""
+    # Scheduled on the monotonic clock so wall-clock jumps don't skew the cadences
+    scheduler = sched.scheduler(time.monotonic, time.sleep)
     
-    active = args.get('active', 'true').lower() == 'true'
-    silenced = args.get('silenced', 'true').lower() == 'true'
-    inhibited = args.get('inhibited', 'true').lower() == 'true'
-    unprocessed = args.get('unprocessed', 'true').lower() == 'true'
+    def run_every(interval, priority, tick):
+        """Run a tick under the state lock and schedule its next run interval seconds after this one"""
+        scheduler.enter(interval, priority, run_every, (interval, priority, tick))
+        with state_lock:
+            tick()
     
-    for alert in alert_list:
-        state = alert["status"]["state"]
-        
-        if state == "active" and not active:
-            continue
-        if state == "suppressed" and not silenced:
-            continue
-        if state == "unprocessed" and not unprocessed:
-            continue
-        if alert["status"]["inhibitedBy"] and not inhibited:
-            continue
-            
-        filtered.append(alert)
+    # Ticks due at the same time run in priority order
+    scheduler.enter(0, 0, run_every, (GENERATE_INTERVAL, 0, generate_tick))
+    scheduler.enter(CLEANUP_INTERVAL, 1, run_every, (CLEANUP_INTERVAL, 1, cleanup_tick))
+    scheduler.enter(SILENCE_CHECK_INTERVAL, 2, run_every, (SILENCE_CHECK_INTERVAL, 2, silence_tick))
+    scheduler.enter(RESOLUTION_INTERVAL, 3, run_every, (RESOLUTION_INTERVAL, 3, resolve_tick))
+    scheduler.run()
+
+# Bit per alert state that the active, silenced and unprocessed query parameters can exclude
+STATE_BITS = {"active": 1, "suppressed": 2, "unprocessed": 4}
+STATE_QUERY_PARAMS = (("active", "active"), ("silenced", "suppressed"), ("unprocessed", "unprocessed"))
+
+def parse_state_flags(args):
+    """Parse the state query parameters into a bitmask of excluded states and the inhibited flag"""
+    excluded = 0
+    for param, state in STATE_QUERY_PARAMS:
+        if args.get(param, 'true').lower() != 'true':
+            excluded |= STATE_BITS[state]
     
-    return filtered
+    return excluded, args.get('inhibited', 'true').lower() == 'true'
+
+def parse_label_filters(args):
+    """Parse key=value filter query parameters into (key, value) pairs"""
+    return [tuple(filter_str.split('=', 1)) for filter_str in args.getlist('filter') if '=' in filter_str]
+
+def alert_matches_state(alert, state_flags):
+    """Check an alert against parsed state flags"""
+    excluded, inhibited = state_flags
+    status = alert["status"]
+    
+    # States without a bit (e.g. resolved) are never excluded
+    if STATE_BITS.get(status["state"], 0) & excluded:
+        return False
+    if status["inhibitedBy"] and not inhibited:
+        return False
+    
+    return True
 
 # API v2 Endpoints (OpenAPI compliant)
 
+# Static part of the status response, serialized once without its closing brace
+_STATUS_PREFIX = orjson.dumps({
+    "cluster": {
+        "name": "fake-alertmanager-cluster",
+        "status": "ready",
+        "peers": [
+            {
+                "name": "fake-alertmanager-1",
+                "address": "127.0.0.1:9093"
+            }
+        ]
+    },
+    "versionInfo": {
+        "version": "0.26.0-fake",
+        "revision": "fake-revision-12345",
+        "branch": "main",
+        "buildUser": "fake-user@example.com",
+        "buildDate": "2024-01-01T00:00:00Z",
+        "goVersion": "go1.21.0"
+    },
+    "config": {
+        "original": "global:\n  smtp_smarthost: 'localhost:587'\nroute:\n  group_by: ['alertname']\n  receiver: 'web.hook'\nreceivers:\n- name: 'web.hook'\n  webhook_configs:\n  - url: 'http://localhost:5001/'"
+    }
+})[:-1]
+
+# Receivers never change at runtime, so their response body is built once
+_RECEIVERS_BODY = orjson.dumps([{"name": name} for name in RECEIVER_NAMES])
+
 @app.route('/api/v2/status', methods=['GET'])
 def get_status():
     """Get current status of Alertmanager instance and its cluster"""
-    return jsonify({
-        "cluster": {
-            "name": "fake-alertmanager-cluster",
-            "status": "ready",
-            "peers": [
-                {
-                    "name": "fake-alertmanager-1",
-                    "address": "127.0.0.1:9093"
-                }
-            ]
-        },
-        "versionInfo": {
-            "version": "0.26.0-fake",
-            "revision": "fake-revision-12345",
-            "branch": "main",
-            "buildUser": "fake-user@example.com",
-            "buildDate": "2024-01-01T00:00:00Z",
-            "goVersion": "go1.21.0"
-        },
-        "config": {
-            "original": "global:\n  smtp_smarthost: 'localhost:587'\nroute:\n  group_by: ['alertname']\n  receiver: 'web.hook'\nreceivers:\n- name: 'web.hook'\n  webhook_configs:\n  - url: 'http://localhost:5001/'"
-        },
-        "uptime": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-    })
+    # Only uptime changes between calls; it is appended to the cached prefix
+    body = _STATUS_PREFIX + b',"uptime":' + orjson.dumps(datetime.now(UTC), option=ORJSON_OPTIONS) + b'}'
+    return json_response(body)
 
 @app.route('/api/v2/receivers', methods=['GET'])
 def get_receivers():
     """Get list of all receivers"""
-    return jsonify([{"name": name} for name in RECEIVER_NAMES])
+    return json_response(_RECEIVERS_BODY)
+
+def filter_alerts(args):
+    """Filter all alerts based on query parameters"""
+    state_flags = parse_state_flags(args)
+    label_filters = parse_label_filters(args)
+    receiver_filter = args.get('receiver')
+    
+    # State, receiver and label filters (simplified implementation) in a single pass
+    return [
+        alert for alert in alerts.values()
+        if alert_matches_state(alert, state_flags)
+        and (not receiver_filter or any(receiver_filter in recv["name"] for recv in alert["receivers"]))
+        and all(alert["labels"].get(key) == value for key, value in label_filters)
+    ]
+
+@functools.lru_cache(maxsize=64)
+def alerts_response_body(query_string, version):
+    """Serialized alerts response for a query string at a given alerts_version"""
+    args = MultiDict(parse_qsl(query_string.decode(), keep_blank_values=True))
+    return orjson.dumps(filter_alerts(args), option=ORJSON_OPTIONS)
 
 @app.route('/api/v2/alerts', methods=['GET'])
 def get_alerts():
     """Get a list of alerts with filtering support"""
-    filtered_alerts = filter_alerts_by_params(alerts, request.args)
-    
-    # Apply additional filters
-    filters = request.args.getlist('filter')
-    receiver_filter = request.args.get('receiver')
-    
-    if receiver_filter:
-        filtered_alerts = [
-            alert for alert in filtered_alerts
-            if any(receiver_filter in recv["name"] for recv in alert["receivers"])
-        ]
-    
-    # Apply label filters (simplified implementation)
-    for filter_str in filters:
-        if '=' in filter_str:
-            key, value = filter_str.split('=', 1)
-            filtered_alerts = [
-                alert for alert in filtered_alerts
-                if alert["labels"].get(key) == value
-            ]
-    
-    return jsonify(filtered_alerts)
+    with state_lock:
+        body = alerts_response_body(request.query_string, alerts_version)
+    return json_response(body)
 
 @app.route('/api/v2/alerts', methods=['POST'])
 def post_alerts():
     """Create new alerts"""
     try:
-        new_alerts = request.get_json()
+        new_alerts = orjson.loads(request.get_data())
         
         if not isinstance(new_alerts, list):
-            return jsonify("Request body must be a list of alerts"), 400
+            return j("Request body must be a list of alerts", 400)
         
+        # Validate required fields for the whole batch before storing anything
         for alert_data in new_alerts:
-            # Validate required fields
             if not alert_data.get('labels'):
-                return jsonify("Alert must have labels"), 400
-            
-            # Create alert with defaults
-            alert = {
+                return j("Alert must have labels", 400)
+            if not all(isinstance(value, str) for value in alert_data['labels'].values()):
+                return j("Alert label values must be strings", 400)
+        
+        # Timestamp defaults shared by every alert in the batch
+        now = datetime.now(UTC)
+        default_ends_at = now + timedelta(hours=1)
+        
+        # Create alerts with defaults
+        batch = [
+            {
                 "labels": alert_data["labels"],
                 "annotations": alert_data.get("annotations", {}),
-                "startsAt": alert_data.get("startsAt", datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ')),
-                "endsAt": alert_data.get("endsAt", (datetime.now(UTC) + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%S.%fZ')),
-                "updatedAt": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                "startsAt": alert_data.get("startsAt", now),
+                "endsAt": alert_data.get("endsAt", default_ends_at),
+                "updatedAt": now,
                 "generatorURL": alert_data.get("generatorURL", ""),
                 "fingerprint": generate_fingerprint(),
-                "receivers": [{"name": random.choice(RECEIVER_NAMES)}],
+                "receivers": [{"name": draw_receiver()}],
                 "status": {
                     "state": "active",
                     "silencedBy": [],
@@ -551,84 +859,107 @@ def post_alerts():
                     "mutedBy": []
                 }
             }
+            for alert_data in new_alerts
+        ]
+        
+        with state_lock:
+            for alert in batch:
+                store_alert(alert)
             
-            alerts.append(alert)
+            trim_alerts()
+            mark_alerts_changed()
         
-        create_alert_groups()
-        return jsonify({"message": "Alerts created successfully"}), 200
+        return j({"message": "Alerts created successfully"}, 200)
         
     except Exception as e:
-        return jsonify(f"Error creating alerts: {str(e)}"), 500
+        # Part of the batch may already be stored
+        with state_lock:
+            mark_alerts_changed()
+        return j(f"Error creating alerts: {str(e)}", 500)
 
-@app.route('/api/v2/alerts/groups', methods=['GET'])
-def get_alert_groups():
-    """Get a list of alert groups"""
-    # Apply the same filtering as individual alerts
+def filter_alert_groups(args):
+    """Filter alert groups based on query parameters"""
+    # Apply the same filtering as individual alerts, parsing the parameters once
     filtered_groups = []
+    state_flags = parse_state_flags(args)
+    label_filters = parse_label_filters(args)
+    receiver_filter = args.get('receiver')
     
-    for group in alert_groups:
-        filtered_alerts = filter_alerts_by_params(group["alerts"], request.args)
-        
+    for group in alert_groups.values():
         # Apply receiver filter
-        receiver_filter = request.args.get('receiver')
         if receiver_filter and receiver_filter not in group["receiver"]["name"]:
             continue
         
-        # Apply label filters
-        filters = request.args.getlist('filter')
-        for filter_str in filters:
-            if '=' in filter_str:
-                key, value = filter_str.split('=', 1)
-                filtered_alerts = [
-                    alert for alert in filtered_alerts
-                    if alert["labels"].get(key) == value
-                ]
+        # Apply state and label filters in a single pass
+        filtered_alerts = [
+            alert for alert in group["alerts"]
+            if alert_matches_state(alert, state_flags)
+            and all(alert["labels"].get(key) == value for key, value in label_filters)
+        ]
         
-        if filtered_alerts:
-            filtered_group = group.copy()
-            filtered_group["alerts"] = filtered_alerts
-            filtered_groups.append(filtered_group)
+        if len(filtered_alerts) == len(group["alerts"]):
+            # Nothing was filtered out, so the group can be returned as is
+            filtered_groups.append(group)
+        elif filtered_alerts:
+            filtered_groups.append({**group, "alerts": filtered_alerts})
     
-    return jsonify(filtered_groups)
+    return filtered_groups
+
+@functools.lru_cache(maxsize=64)
+def alert_groups_response_body(query_string, version):
+    """Serialized alert groups response for a query string at a given alerts_version"""
+    args = MultiDict(parse_qsl(query_string.decode(), keep_blank_values=True))
+    return orjson.dumps(filter_alert_groups(args), option=ORJSON_OPTIONS)
+
+@app.route('/api/v2/alerts/groups', methods=['GET'])
+def get_alert_groups():
+    """Get a list of alert groups"""
+    with state_lock:
+        body = alert_groups_response_body(request.query_string, alerts_version)
+    return json_response(body)
 
 @app.route('/api/v2/silences', methods=['GET'])
 def get_silences():
     """Get a list of silences"""
     # Apply filter parameter
-    filters = request.args.getlist('filter')
-    filtered_silences = silences.copy()
+    label_filters = parse_label_filters(request.args)
     
-    # Simple filter implementation
-    for filter_str in filters:
-        if '=' in filter_str:
-            key, value = filter_str.split('=', 1)
-            filtered_silences = [
-                silence for silence in filtered_silences
-                if any(matcher["name"] == key and matcher["value"] == value 
-                      for matcher in silence["matchers"])
-            ]
-    
-    return jsonify(filtered_silences)
+    with state_lock:
+        if not label_filters:
+            return j(list(silences.values()))
+        
+        # Silences must have a matcher for every filter: walk the smallest index bucket
+        # and check membership in the others
+        buckets = [silence_matcher_index.get(key_value, {}) for key_value in label_filters]
+        smallest = min(buckets, key=len)
+        filtered_silences = [
+            silences[silence_id] for silence_id in smallest
+            if all(silence_id in bucket for bucket in buckets)
+        ]
+        
+        return j(filtered_silences)
 
 @app.route('/api/v2/silences', methods=['POST'])
 def post_silences():
     """Create a new silence"""
     try:
-        silence_data = request.get_json()
+        silence_data = orjson.loads(request.get_data())
         
         # Validate required fields
         required_fields = ['matchers', 'startsAt', 'endsAt', 'createdBy', 'comment']
         for field in required_fields:
             if field not in silence_data:
-                return jsonify(f"Missing required field: {field}"), 400
+                return j(f"Missing required field: {field}", 400)
         
         # Validate matchers
         if not isinstance(silence_data['matchers'], list) or len(silence_data['matchers']) == 0:
-            return jsonify("Matchers must be a non-empty list"), 400
+            return j("Matchers must be a non-empty list", 400)
         
         for matcher in silence_data['matchers']:
             if not all(key in matcher for key in ['name', 'value', 'isRegex']):
-                return jsonify("Each matcher must have name, value, and isRegex fields"), 400
+                return j("Each matcher must have name, value, and isRegex fields", 400)
+            if not isinstance(matcher['name'], str) or not isinstance(matcher['value'], str):
+                return j("Matcher name and value must be strings", 400)
         
         silence_id = silence_data.get('id', str(uuid.uuid4()))
         
@@ -642,94 +973,76 @@ def post_silences():
             "status": {
                 "state": "active"
             },
-            "updatedAt": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            "updatedAt": datetime.now(UTC)
         }
         
-        # Check if updating existing silence
-        existing_silence = next((s for s in silences if s["id"] == silence_id), None)
-        if existing_silence:
-            silences.remove(existing_silence)
-        
-        silences.append(silence)
-        
-        # Apply the new silence to existing alerts immediately
-        apply_silences_to_alerts()
+        with state_lock:
+            # An updated silence replaces the existing one and moves to the end
+            add_silence(silence)
+            
+            # Apply the new silence to existing alerts immediately
+            apply_silences_to_alerts()
         
-        return jsonify({"silenceID": silence_id}), 200
+        return j({"silenceID": silence_id}, 200)
         
     except Exception as e:
-        return jsonify(f"Error creating silence: {str(e)}"), 400
+        return j(f"Error creating silence: {str(e)}", 400)
 
 @app.route('/api/v2/silence/<silence_id>', methods=['GET'])
 def get_silence(silence_id):
     """Get a silence by its ID"""
-    silence = next((s for s in silences if s["id"] == silence_id), None)
-    if not silence:
-        return jsonify("Silence not found"), 404
-    
-    return jsonify(silence)
+    with state_lock:
+        silence = silences.get(silence_id)
+        if not silence:
+            return j("Silence not found", 404)
+        
+        return j(silence)
 
 @app.route('/api/v2/silence/<silence_id>', methods=['DELETE'])
 def delete_silence(silence_id):
     """Delete a silence by its ID"""
-    silence = next((s for s in silences if s["id"] == silence_id), None)
-    if not silence:
-        return jsonify("Silence not found"), 404
-    
-    # Remove the silence from any alerts before deleting
-    remove_silence_from_alerts(silence_id)
+    with state_lock:
+        if silence_id not in silences:
+            return j("Silence not found", 404)
+        
+        # Remove the silence from any alerts before deleting
+        remove_silence_from_alerts(silence_id)
+        
+        remove_silence(silence_id)
     
-    silences.remove(silence)
-    return jsonify({"message": "Silence deleted successfully"}), 200
+    return j({"message": "Silence deleted successfully"}, 200)
 
 # Health check endpoints
 @app.route('/-/healthy', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy"})
+    return j({"status": "healthy"})
 
 @app.route('/-/ready', methods=['GET'])
 def ready_check():
     """Ready check endpoint"""
-    return jsonify({"status": "ready"})
-
-# Legacy v1 API endpoints for backward compatibility
-@app.route('/api/v1/alerts', methods=['GET'])
-def get_alerts_v1():
-    """Legacy v1 alerts endpoint"""
-    return get_alerts()
-
-@app.route('/api/v1/alerts/groups', methods=['GET'])
-def get_alert_groups_v1():
-    """Legacy v1 alert groups endpoint"""
-    return get_alert_groups()
-
-@app.route('/api/v1/silences', methods=['GET'])
-def get_silences_v1():
-    """Legacy v1 silences endpoint"""
-    return get_silences()
-
-@app.route('/api/v1/silences', methods=['POST'])
-def post_silences_v1():
-    """Legacy v1 create silence endpoint"""
-    return post_silences()
-
-@app.route('/api/v1/status', methods=['GET'])
-def get_status_v1():
-    """Legacy v1 status endpoint"""
-    return get_status()
-
-@app.route('/api/v1/receivers', methods=['GET'])
-def get_receivers_v1():
-    """Legacy v1 receivers endpoint"""
-    return get_receivers()
+    return j({"status": "ready"})
 
-if __name__ == '__main__':
+# Legacy v1 API endpoints for backward compatibility, served by the v2 view functions
+for path, endpoint, view_func, methods in [
+    ('/api/v1/alerts', 'get_alerts_v1', get_alerts, ['GET']),
+    ('/api/v1/alerts/groups', 'get_alert_groups_v1', get_alert_groups, ['GET']),
+    ('/api/v1/silences', 'get_silences_v1', get_silences, ['GET']),
+    ('/api/v1/silences', 'post_silences_v1', post_silences, ['POST']),
+    ('/api/v1/status', 'get_status_v1', get_status, ['GET']),
+    ('/api/v1/receivers', 'get_receivers_v1', get_receivers, ['GET']),
+]:
+    app.add_url_rule(path, endpoint=endpoint, view_func=view_func, methods=methods)
+
+def seed_initial_state():
+    """Populate the initial alerts and silences"""
     # Generate some initial alerts (increased for more active alerts)
     for _ in range(20):
-        alerts.append(generate_random_alert())
+        alert = generate_random_alert()
+        store_alert(alert)
     
     # Add a specific Sentry alert for testing (starts at current time with 0s duration)
+    now = datetime.now(UTC)
     sentry_alert = {
         "labels": {
             "alertname": "QuerylyApplicationError",
@@ -746,9 +1059,9 @@ if __name__ == '__main__':
             "summary": "Critical errors detected in Queryly backend on queryly-back-1.company.net",
             "runbook_url": "https://runbooks.example.com/querylyapplicationerror"
         },
-        "startsAt": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-        "endsAt": (datetime.now(UTC) + timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-        "updatedAt": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+        "startsAt": now,
+        "endsAt": now + timedelta(hours=2),
+        "updatedAt": now,
         "generatorURL": "http://prometheus:9090/graph?g0.expr=up{job=\"queryly-back\"}&g0.tab=1",
         "fingerprint": generate_fingerprint(),
         "receivers": [{"name": "web.hook"}],
@@ -759,7 +1072,7 @@ if __name__ == '__main__':
             "mutedBy": []
         }
     }
-    alerts.append(sentry_alert)
+    store_alert(sentry_alert)
     
     # Generate some initial silences (reduced for fewer silenced alerts)
     for _ in range(1):
@@ -773,25 +1086,31 @@ if __name__ == '__main__':
                     "isEqual": True
                 }
             ],
-            "startsAt": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-            "endsAt": (datetime.now(UTC) + timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            "startsAt": now.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            "endsAt": (now + timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
             "createdBy": "test-user@example.com",
             "comment": f"Test silence {_+1}",
             "status": {
                 "state": "active"
             },
-            "updatedAt": datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            "updatedAt": now
         }
-        silences.append(silence)
-    
-    create_alert_groups()
+        add_silence(silence)
     
     # Apply any initial silences to the initial alerts
     apply_silences_to_alerts()
-    
-    # Start background alert generator
+
+def start_alert_generator():
+    """Start the background alert generator thread"""
     generator_thread = Thread(target=alert_generator, daemon=True)
     generator_thread.start()
+    return generator_thread
+
+if __name__ == '__main__':
+    seed_initial_state()
+    
+    # Start background alert generator
+    start_alert_generator()
     
     print("Starting fake Alertmanager on http://localhost:9093")
     print("OpenAPI v2 compliant endpoints:")
@@ -808,4 +1127,9 @@ if __name__ == '__main__':
     print("  GET  /-/ready")
     print("\nLegacy v1 endpoints also available for backward compatibility")
     
-    app.run(host='0.0.0.0', port=9093, debug=False)
\ No newline at end of file
+    if os.environ.get('DEV_SERVER'):
+        # Werkzeug's development server, for local debugging
+        app.run(host='0.0.0.0', port=9093, debug=False)
+    else:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=9093, threads=8)
\ No newline at end of file
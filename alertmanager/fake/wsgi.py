@@ -0,0 +1,14 @@
+"""WSGI entry point for serving the fake Alertmanager with gunicorn.
+
+All state lives in process memory, so run a single worker and scale with
+threads, e.g.:
+
+    gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:9093 wsgi:application
+"""
+
+from fake_alertmanager import app, seed_initial_state, start_alert_generator
+
+seed_initial_state()
+start_alert_generator()
+
+application = app